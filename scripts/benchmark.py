@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 
 from config import PARAM_CONFIG, ALGORITHMS, DATASETS
-from utils import setup_logging, setup_directories, build_jars, get_datasets_to_run
+from utils import setup_logging, setup_directories, build_jars, get_datasets_to_run, set_jvm_args, set_keep_raw
 import argparse
 
 class Benchmark(ABC):
@@ -25,6 +25,11 @@ class Benchmark(ABC):
         parser.add_argument("--group", choices=["all"] + list(DATASETS.keys()), default="all")
         parser.add_argument("--algos", nargs='+', help="Specific algorithms to run")
         parser.add_argument("--baseline", type=str, help="Algorithm for relative comparisons")
+        parser.add_argument("--jvm-args", type=str, help="Override the default per-run JVM flags (quoted string)")
+        parser.add_argument("--setup-only", action="store_true",
+                            help="Build jars and prepare directories, then exit without benchmarking")
+        parser.add_argument("--keep-raw", action="store_true",
+                            help="Keep downloaded .gz archives so re-preparation never re-downloads")
 
         for p_name, p_data in PARAM_CONFIG.items():
             parser.add_argument(f"--{p_name}", type=type(p_data["default"]), default=p_data["default"])
@@ -74,6 +79,8 @@ class Benchmark(ABC):
     def setup(self):
         """Logic for setting up the benchmark environment."""
         self.datasets_to_run = get_datasets_to_run(self.args)
+        set_jvm_args(self.args.jvm_args)
+        set_keep_raw(self.args.keep_raw)
         setup_directories()
         build_jars(self.args.local, self.logger, self.active_algos.items())
 
@@ -86,6 +93,10 @@ class Benchmark(ABC):
         self.logger.info("=" * 10 + f"{' STAGE 1: SETUP & COMPILATION ':^30}" + "=" * 10)
         self.setup()
 
+        if self.args.setup_only:
+            self.logger.info("[*] --setup-only: jars built and directories ready, skipping benchmark.")
+            return
+
         self.logger.info("[*] Global Execution Parameters:")
         for arg_key, arg_val in vars(self.args).items():
             if arg_key not in PARAM_CONFIG:
@@ -1,9 +1,11 @@
+import csv
 import os
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
 from tabulate import tabulate
 
 from config import BENCHMARK_DIR, RUNS_DIR, PARAM_CONFIG
-from utils import download_and_prepare_dataset, prepare_dataset, format_dataframe_with_baseline, run_multiple_mosso
+from utils import prepare_datasets, format_rows_with_baseline, result_strategies, average_rows, run_multiple_mosso
 from plotter import plot_results, plot_runs_variance
 from benchmark import Benchmark
 
@@ -13,6 +15,12 @@ class CompareBenchmark(Benchmark):
 
     def add_custom_args(self, parser):
         parser.add_argument("--keep-summaries", action="store_true")
+        parser.add_argument("--parallel-algos", action="store_true",
+                            help="Run the algorithms' JVMs concurrently per dataset (faster, may perturb timings)")
+        parser.add_argument("--jobs", type=int, default=1,
+                            help="Benchmark this many datasets concurrently (faster, may perturb timings)")
+        parser.add_argument("--pin-cpus", action="store_true",
+                            help="With --parallel-algos, pin each JVM to a disjoint CPU range via taskset")
 
     def get_log_prefix(self):
         return "compare"
@@ -24,21 +32,34 @@ class CompareBenchmark(Benchmark):
         timestamp = self.timestamp
 
         results = []
-
-        for i, (url, filename) in enumerate(datasets_to_run, 1):
+        prepared_paths = prepare_datasets(datasets_to_run, logger)
+
+        # Carve the machine into disjoint CPU ranges so concurrent JVMs do not
+        # steal each other's cores; without pinning the scheduler migrates them
+        # and the timings of parallel runs bleed into one another.
+        cpu_ranges = {}
+        if args.pin_cpus and args.parallel_algos and len(self.active_algos) > 1:
+            total = os.cpu_count() or 1
+            share = max(1, total // len(self.active_algos))
+            for idx, algo_name in enumerate(self.active_algos):
+                lo = (idx * share) % total
+                cpu_ranges[algo_name] = f"{lo}-{min(lo + share, total) - 1}"
+
+        def benchmark_dataset(index, filename):
             dataset_name = filename.replace(".txt", "").replace(".csv", "")
-            path = prepare_dataset(filename, logger) if url == "local" else download_and_prepare_dataset(url, filename,
-                                                                                                         logger)
-            if not path: continue
+            future = prepared_paths.get(filename)
+            path = future.result() if future else None
+            if not path:
+                return None
 
-            logger.info(f"[{i}/{len(datasets_to_run)}] Benchmarking [{dataset_name}] ({args.runs} runs) ...")
+            logger.info(f"[{index}/{len(datasets_to_run)}] Benchmarking [{dataset_name}] ({args.runs} runs) ...")
             current_result = {"Dataset": dataset_name}
             all_times_dict, all_ratios_dict = {}, {}
 
-            for algo_name, algo_config in self.active_algos.items():
+            def bench_algo(algo_name, algo_config):
                 jar_file = f"mosso-{algo_name}.jar"
                 if not os.path.exists(jar_file):
-                    continue
+                    return algo_name, None, None, None, None
 
                 template = algo_config.get('template')
                 params = algo_config.get('params', {})
@@ -49,37 +70,67 @@ class CompareBenchmark(Benchmark):
 
                 t_avg, r_avg, t_list, r_list = run_multiple_mosso(
                     jar_file, path, f"{algo_name}_{dataset_name}_{timestamp}",
-                    args.runs, not args.keep_summaries, logger, resolved_params, template
+                    args.runs, not args.keep_summaries, logger, resolved_params, template,
+                    cpus=cpu_ranges.get(algo_name)
                 )
+                return algo_name, t_avg, r_avg, t_list, r_list
+
+            if args.parallel_algos and len(self.active_algos) > 1:
+                with ThreadPoolExecutor(max_workers=len(self.active_algos)) as ex:
+                    outcomes = list(ex.map(lambda item: bench_algo(*item), self.active_algos.items()))
+            else:
+                outcomes = [bench_algo(name, cfg) for name, cfg in self.active_algos.items()]
 
+            for algo_name, t_avg, r_avg, t_list, r_list in outcomes:
                 if t_avg is not None:
                     current_result[f"Time_{algo_name}"], current_result[f"Ratio_{algo_name}"] = t_avg, r_avg
                     logger.info(f"\t=> {algo_name: <12} Time: {t_avg:.3f}s | Ratio: {r_avg:.5f}")
                     if args.runs > 1:
                         all_times_dict[algo_name], all_ratios_dict[algo_name] = t_list, r_list
 
+            return dataset_name, current_result, all_times_dict, all_ratios_dict
+
+        indexed = [(i, filename) for i, (url, filename) in enumerate(datasets_to_run, 1)]
+        if args.jobs > 1:
+            with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+                outputs = list(ex.map(lambda pair: benchmark_dataset(*pair), indexed))
+        else:
+            outputs = [benchmark_dataset(i, filename) for i, filename in indexed]
+
+        for output in outputs:
+            if output is None:
+                continue
+            dataset_name, current_result, all_times_dict, all_ratios_dict = output
             results.append(current_result)
+            # Plot in the main thread; matplotlib is not thread-safe.
             if args.runs > 1:
                 plot_runs_variance(f"{dataset_name}_{timestamp}", all_times_dict, all_ratios_dict, RUNS_DIR)
 
         self.results = results
 
     def print_table(self):
-        df = pd.DataFrame(self.results)
-        strategies = [col.replace("Time_", "") for col in df.columns if col.startswith("Time_")]
+        rows = list(self.results)
+        strategies = result_strategies(rows)
 
-        avg_row = df.mean(numeric_only=True).to_dict()
-        avg_row['Dataset'] = 'AVERAGE'
-        df = pd.concat([df, pd.DataFrame([avg_row])], ignore_index=True)
+        avg_row = {"Dataset": "AVERAGE", **average_rows(rows)[0]}
+        rows.append(avg_row)
 
-        display_df = format_dataframe_with_baseline(df, strategies, self.args.baseline)
-        table_str = tabulate(display_df, headers='keys', tablefmt='grid', showindex=False)
+        display_rows = format_rows_with_baseline(rows, strategies, self.args.baseline)
+        table_str = tabulate(display_rows, headers='keys', tablefmt='grid', showindex=False)
         for line in table_str.split('\n'):
             self.logger.info(line)
 
     def finalize(self):
         csv_file = os.path.join(self.save_dir, f"results_{self.timestamp}.csv")
-        pd.DataFrame(self.results).to_csv(csv_file, index=False)
+        fieldnames = []
+        for row in self.results:
+            for key in row:
+                if key not in fieldnames:
+                    fieldnames.append(key)
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+            writer.writeheader()
+            writer.writerows(self.results)
         plot_results(csv_file, os.path.join(self.save_dir, f"plot_{self.timestamp}.pdf"), self.logger)
 
 
@@ -15,7 +15,7 @@ BASE_REPO_URL = "https://github.com/TDT4900-Masteroppgave/mosso-mags-dm.git"
 PARAM_CONFIG = {
     "c": {"description": "sample number", "default": 120, "bounds": (10, 240)},
     "e": {"description": "escape", "default": 3, "bounds": (1, 9)},
-    "interval": {"description": "interval", "default": 1000, "bounds": (1000, 1000)},
+    "interval": {"description": "progress interval (<= 0 disables progress output)", "default": 1000, "bounds": (1000, 1000)},
     "b": {"description": "top candidates", "default": 5, "bounds": (1, 10)},
     "h": {"description": "hashes", "default": 4, "bounds": (4, 40)},
     "cap": {"description": "size of partitions", "default": 15, "bounds": (1, 60)}
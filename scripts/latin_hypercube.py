@@ -5,7 +5,7 @@ from scipy.stats import qmc
 
 from config import PARAM_CONFIG, OUTPUT_DIR
 from plotter import plot_pareto_front, get_pareto_front_2d
-from utils import prepare_dataset, download_and_prepare_dataset, run_multiple_mosso
+from utils import prepare_datasets, run_multiple_mosso
 from benchmark import Benchmark
 
 LHS_DIR = os.path.join(OUTPUT_DIR, "lhs_optimization")
@@ -45,9 +45,11 @@ class LHSBenchmark(Benchmark):
 
     def process(self):
         results = []
+        prepared_paths = prepare_datasets(self.datasets_to_run, self.logger)
         for i, (url, filename) in enumerate(self.datasets_to_run, 1):
             dataset_name = filename.replace(".txt", "").replace(".csv", "")
-            path = prepare_dataset(filename, self.logger) if url == "local" else download_and_prepare_dataset(url, filename, self.logger)
+            future = prepared_paths.get(filename)
+            path = future.result() if future else None
             if not path: continue
 
             for algo_name, algo_config in self.active_algos.items():
@@ -1,9 +1,12 @@
+import csv
 import os
-import pandas as pd
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
 from tabulate import tabulate
 
 from config import SWEEP_DIR, PARAM_CONFIG
-from utils import download_and_prepare_dataset, prepare_dataset, format_dataframe_with_baseline, run_multiple_mosso
+from utils import prepare_datasets, format_rows_with_baseline, result_strategies, average_rows, run_multiple_mosso
 from plotter import plot_parameter_analysis
 from benchmark import Benchmark
 
@@ -17,6 +20,12 @@ class ParameterSweepBenchmark(Benchmark):
     def add_custom_args(self, parser):
         parser.add_argument("--param", choices=list(PARAM_CONFIG.keys()), required=True)
         parser.add_argument("--range", type=int, nargs=3)
+        parser.add_argument("--jobs", type=int, default=1,
+                            help="Concurrent JVM runs per sweep value (each JVM is itself multi-threaded)")
+        parser.add_argument("--resume", type=str,
+                            help="CSV from an interrupted sweep; its rows are kept and their runs skipped")
+        parser.add_argument("--pin-cpus", action="store_true",
+                            help="With --jobs > 1, pin each concurrent JVM to a disjoint CPU range via taskset")
 
     def get_log_prefix(self):
         return f"sweep_{self.args.param}"
@@ -35,19 +44,81 @@ class ParameterSweepBenchmark(Benchmark):
         param = self.args.param
 
         results = []
+        prepared_paths = prepare_datasets(datasets_to_run, logger)
+
+        master_csv = os.path.join(SWEEP_DIR, f"sweep_{param}_results_{timestamp}.csv")
+        plot_file = os.path.join(SWEEP_DIR, f"sweep_{param}_plot_{timestamp}.pdf")
+        fieldnames = ["Dataset", param]
+        for algo_name in self.active_algos:
+            fieldnames += [f"Time_{algo_name}", f"Ratio_{algo_name}"]
+
+        csv_f = open(master_csv, 'w', newline='')
+        writer = csv.DictWriter(csv_f, fieldnames=fieldnames, restval="", extrasaction='ignore')
+        writer.writeheader()
+
+        # Carry over rows from an interrupted sweep and skip their runs.
+        done = set()
+        if args.resume and os.path.exists(args.resume):
+            with open(args.resume, newline='') as prev_f:
+                for prev in csv.DictReader(prev_f):
+                    if not prev.get("Dataset") or not prev.get(param):
+                        continue
+                    row = {"Dataset": prev["Dataset"]}
+                    for key, value in prev.items():
+                        if key != "Dataset" and value not in (None, ""):
+                            row[key] = float(value)
+                    writer.writerow(row)
+                    results.append(row)
+                    done.add((row["Dataset"], row[param]))
+            csv_f.flush()
+            logger.info(f"[*] Resumed {len(done)} completed (dataset, {param}) pairs from {args.resume}")
+
+        # With --pin-cpus, concurrent jobs borrow disjoint CPU ranges from a
+        # pool so parallel JVMs cannot be scheduled onto the same cores.
+        cpu_pool = None
+        if args.pin_cpus and args.jobs > 1:
+            total = os.cpu_count() or 1
+            share = max(1, total // args.jobs)
+            cpu_pool = queue.SimpleQueue()
+            for slot in range(args.jobs):
+                lo = (slot * share) % total
+                cpu_pool.put(f"{lo}-{min(lo + share, total) - 1}")
+
+        def run_job(job):
+            dataset_name, algo_name, jar_file, path, resolved_params, template, val = job
+            cpus = cpu_pool.get() if cpu_pool else None
+            try:
+                t, r, _, _ = run_multiple_mosso(
+                    jar_file, path, f"{algo_name}_{dataset_name}_{param}{val}_{timestamp}",
+                    args.runs, True, logger, resolved_params, template, cpus=cpus)
+            finally:
+                if cpu_pool:
+                    cpu_pool.put(cpus)
+            if t is not None:
+                logger.info(f"\t=> {algo_name: <12} [{dataset_name} | {param}={val}] Time: {t:.3f}s | Ratio: {r:.5f}")
+            return job, t, r
+
+        # Algorithms that pin the swept parameter (or do not take it at all)
+        # resolve to identical run parameters for every sweep value; cache
+        # their results instead of re-launching |values| identical JVM runs.
+        memo = {}
+
+        def job_key(job):
+            _, _, jar_file, path, resolved_params, template, _ = job
+            return jar_file, path, tuple(template), tuple(sorted(resolved_params.items()))
 
         for val in self.sweep_values:
-            logger.info(f"--- Testing {param.upper()} = {val} ---")
+            logger.info(f"--- Testing {param.upper()} = {val} ({len(datasets_to_run)} datasets, {args.runs} runs) ---")
 
-            for i, (url, filename) in enumerate(datasets_to_run, 1):
+            jobs, cached_outcomes = [], []
+            for url, filename in datasets_to_run:
                 dataset_name = filename.replace(".txt", "").replace(".csv", "")
-                path = prepare_dataset(filename, logger) if url == "local" else download_and_prepare_dataset(url,
-                                                                                                             filename,
-                                                                                                             logger)
+                future = prepared_paths.get(filename)
+                path = future.result() if future else None
                 if not path: continue
-
-                logger.info(f"[{i}/{len(datasets_to_run)}] Running {dataset_name} ({args.runs} runs) ...")
-                current_result = {"Dataset": dataset_name, param: val}
+                if (dataset_name, float(val)) in done:
+                    logger.info(f"\t=> [{dataset_name} | {param}={val}] already in resume CSV, skipping")
+                    continue
 
                 for algo_name, algo_config in self.active_algos.items():
                     jar_file = f"mosso-{algo_name}.jar"
@@ -63,37 +134,56 @@ class ParameterSweepBenchmark(Benchmark):
                         current_fallback = val if param == p_key else getattr(args, p_key)
                         resolved_params[p_key] = params.get(p_key, current_fallback)
 
-                    t, r, _, _ = run_multiple_mosso(
-                        jar_file, path, f"{algo_name}_{dataset_name}_{param}{val}_{timestamp}",
-                        args.runs, True, logger, resolved_params, template)
-
-                    if t is not None:
-                        current_result[f"Time_{algo_name}"], current_result[f"Ratio_{algo_name}"] = t, r
-                        logger.info(f"\t=> {algo_name: <12} Time: {t:.3f}s | Ratio: {r:.5f}")
-
-                results.append(current_result)
+                    job = (dataset_name, algo_name, jar_file, path, resolved_params, template, val)
+                    cached = memo.get(job_key(job))
+                    if cached is not None:
+                        logger.debug(f"\t=> {algo_name: <12} [{dataset_name} | {param}={val}] parameters unchanged, reusing result")
+                        cached_outcomes.append((job, *cached))
+                    else:
+                        jobs.append(job)
+
+            if args.jobs > 1:
+                with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+                    outcomes = list(ex.map(run_job, jobs))
+            else:
+                outcomes = [run_job(job) for job in jobs]
+
+            for outcome in outcomes:
+                job, t, r = outcome
+                memo[job_key(job)] = (t, r)
+            outcomes += cached_outcomes
+
+            rows = {}
+            for job, t, r in outcomes:
+                dataset_name, algo_name = job[0], job[1]
+                row = rows.setdefault(dataset_name, {"Dataset": dataset_name, param: val})
+                if t is not None:
+                    row[f"Time_{algo_name}"], row[f"Ratio_{algo_name}"] = t, r
+
+            for row in rows.values():
+                results.append(row)
+                writer.writerow(row)
+                csv_f.flush()
 
             if results:
-                master_csv = os.path.join(SWEEP_DIR, f"sweep_{param}_results_{timestamp}.csv")
-                pd.DataFrame(results).to_csv(master_csv, index=False)
-                plot_parameter_analysis(master_csv, param,
-                                        os.path.join(SWEEP_DIR, f"sweep_{param}_plot_{timestamp}.pdf"))
+                plot_parameter_analysis(master_csv, param, plot_file)
 
+        csv_f.close()
         self.results = results
 
     def print_table(self):
-        df = pd.DataFrame(self.results)
-        strategies = [col.replace("Time_", "") for col in df.columns if col.startswith("Time_")]
+        rows = self.results
+        strategies = result_strategies(rows)
 
         self.logger.info(f"--- SWEEP LOG ({self.args.param.upper()}) ---")
-        display_df = format_dataframe_with_baseline(df, strategies, self.args.baseline)
-        table_str = tabulate(display_df, headers='keys', tablefmt='grid', showindex=False)
+        display_rows = format_rows_with_baseline(rows, strategies, self.args.baseline)
+        table_str = tabulate(display_rows, headers='keys', tablefmt='grid', showindex=False)
         for line in table_str.split('\n'):
             self.logger.info(line)
 
         self.logger.info(f"--- AVERAGES BY {self.args.param.upper()} ---")
-        avg_df = df.groupby(self.args.param).mean(numeric_only=True).reset_index()
-        display_avg = format_dataframe_with_baseline(avg_df, strategies, self.args.baseline)
+        avg_rows = average_rows(rows, group_key=self.args.param)
+        display_avg = format_rows_with_baseline(avg_rows, strategies, self.args.baseline)
         table_str = tabulate(display_avg, headers='keys', tablefmt='grid', showindex=False)
         for line in table_str.split('\n'):
             self.logger.info(line)
@@ -1,9 +1,25 @@
+import logging
 import os
-import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Headless backend: skips GUI toolkit probing at import
+matplotlib.rcParams.update({
+    "pdf.fonttype": 42,            # embed TrueType directly instead of subsetting Type 3
+    "figure.max_open_warning": 0,  # sweeps legitimately produce many figures
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000,   # render long line plots in chunks
+})
 import matplotlib.pyplot as plt
 import numpy as np
 
-def plot_results(csv_file, plot_file, logger):
+__all__ = ["plot_results", "plot_runs_variance", "plot_parameter_analysis",
+           "get_pareto_front_2d", "plot_pareto_front"]
+
+_log = logging.getLogger(__name__)
+
+def plot_results(csv_file, plot_file, logger=None):
+    import pandas as pd
+    logger = logger or _log
     df = pd.read_csv(csv_file)
     if df.empty: return
 
@@ -12,7 +28,7 @@ def plot_results(csv_file, plot_file, logger):
     ratio_cols = [f"Ratio_{s}" for s in strategies]
     time_cols = [f"Time_{s}" for s in strategies]
 
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6), layout="constrained")
 
     # Use a dynamic colormap
     cmap = plt.get_cmap('tab10')
@@ -28,14 +44,13 @@ def plot_results(csv_file, plot_file, logger):
     axes[1].tick_params(axis='x', rotation=45 if len(df) > 1 else 0)
     axes[1].legend(strategies)
 
-    plt.tight_layout()
     plt.savefig(plot_file)
     logger.debug(f"Saved bar plot to {plot_file}")
     plt.close()
 
 def plot_runs_variance(dataset_name, all_times_dict, all_ratios_dict, runs_dir):
     # Updated to handle dictionaries of lists (one list per strategy)
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6), layout="constrained")
     cmap = plt.get_cmap('tab10')
     colors = cmap(np.linspace(0, 1, len(all_times_dict)))
     markers = ['o', 's', '^', 'D', 'v', 'p', '*']
@@ -45,26 +60,28 @@ def plot_runs_variance(dataset_name, all_times_dict, all_ratios_dict, runs_dir):
         runs_x = list(range(1, len(times) + 1))
         marker = markers[idx % len(markers)]
 
-        axes[0].plot(runs_x, all_ratios_dict[strat], marker=marker, color=colors[idx], label=strat)
-        axes[1].plot(runs_x, times, marker=marker, color=colors[idx], label=strat)
+        # Rasterize the data layers: long series stay bitmap inside the PDF
+        # instead of thousands of vector path elements.
+        axes[0].plot(runs_x, all_ratios_dict[strat], marker=marker, color=colors[idx], label=strat, rasterized=True)
+        axes[1].plot(runs_x, times, marker=marker, color=colors[idx], label=strat, rasterized=True)
 
     axes[0].set_title("Compression Ratio Variance")
     axes[0].legend()
     axes[1].set_title("Execution Time Variance")
     axes[1].legend()
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(runs_dir, f"{dataset_name}_variance_plot.pdf"))
+    plt.savefig(os.path.join(runs_dir, f"{dataset_name}_variance_plot.pdf"), dpi=150)
     plt.close()
 
 def plot_parameter_analysis(csv_file, param_name, plot_file):
+    import pandas as pd
     df = pd.read_csv(csv_file)
     if df.empty: return
 
     strategies = [col.replace("Time_", "") for col in df.columns if col.startswith("Time_")]
     avg_df = df.groupby(param_name).mean(numeric_only=True).reset_index()
 
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6), layout="constrained")
     cmap = plt.get_cmap('tab10')
     colors = cmap(np.linspace(0, 1, len(strategies)))
     markers = ['o', 's', '^', 'D', 'v', 'p', '*']
@@ -77,8 +94,8 @@ def plot_parameter_analysis(csv_file, param_name, plot_file):
         line_style ='-'
         line_width = 2.5
 
-        axes[0].plot(avg_df[param_name], avg_df[f'Ratio_{strat}'], marker=marker, linestyle=line_style, color=color, linewidth=line_width, markersize=8, label=strat)
-        axes[1].plot(avg_df[param_name], avg_df[f'Time_{strat}'], marker=marker, linestyle=line_style, color=color, linewidth=line_width, markersize=8, label=strat)
+        axes[0].plot(avg_df[param_name], avg_df[f'Ratio_{strat}'], marker=marker, linestyle=line_style, color=color, linewidth=line_width, markersize=8, label=strat, rasterized=True)
+        axes[1].plot(avg_df[param_name], avg_df[f'Time_{strat}'], marker=marker, linestyle=line_style, color=color, linewidth=line_width, markersize=8, label=strat, rasterized=True)
 
     axes[0].set_title(f"Average Compression Ratio vs {param_name.upper()}", fontsize=14, fontweight='bold')
     axes[0].set_xlabel(f"Parameter: {param_name.upper()}", fontsize=12)
@@ -96,8 +113,7 @@ def plot_parameter_analysis(csv_file, param_name, plot_file):
     axes[1].grid(True, linestyle=':', alpha=0.7)
     axes[1].legend(fontsize=11)
 
-    plt.tight_layout()
-    plt.savefig(plot_file)
+    plt.savefig(plot_file, dpi=150)
     plt.close()
 
 def get_pareto_front_2d(df, x_col, y_col):
@@ -105,6 +121,8 @@ def get_pareto_front_2d(df, x_col, y_col):
     Calculates the Pareto front for two metrics we want to MINIMIZE.
     O(n log n) efficiency using sorting.
     """
+    import pandas as pd
+
     # Sort by Time ascending, then Ratio ascending
     sorted_df = df.sort_values(by=[x_col, y_col])
     pareto_front = []
@@ -118,6 +136,7 @@ def get_pareto_front_2d(df, x_col, y_col):
     return pd.DataFrame(pareto_front)
 
 def plot_pareto_front(csv_file, plot_file):
+    import pandas as pd
     df = pd.read_csv(filepath_or_buffer=str(csv_file)) # Fixed IDE warning
     if df.empty: return
 
@@ -0,0 +1,36 @@
+package mosso;
+
+import java.io.BufferedReader;
+import java.io.FileReader;
+import java.io.IOException;
+
+/**
+ * Runs several summarization jobs in one JVM so class loading and JIT warmup
+ * are paid once instead of once per dataset.
+ *
+ * Usage: java -cp ... mosso.BatchRun manifest.tsv
+ *
+ * Each manifest line holds one tab-separated argument list in the same order
+ * mosso.Run expects (inputPath, outputPath, mode, params...). Blank lines and
+ * lines starting with '#' are skipped. Output blocks are delimited so a driver
+ * can split the log per job.
+ */
+public class BatchRun {
+
+    public static void main(String[] args) throws IOException {
+        if (args.length < 1) {
+            System.out.println("Usage: mosso.BatchRun <manifest.tsv>");
+            return;
+        }
+        try (BufferedReader br = new BufferedReader(new FileReader(args[0]))) {
+            String line;
+            while ((line = br.readLine()) != null) {
+                if (line.isEmpty() || line.startsWith("#")) continue;
+                String[] runArgs = line.split("\t");
+                System.out.println("===BEGIN " + runArgs[0] + "===");
+                Run.main(runArgs);
+                System.out.println("===END===");
+            }
+        }
+    }
+}
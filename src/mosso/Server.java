@@ -0,0 +1,34 @@
+package mosso;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+
+/**
+ * Long-lived worker that reads one mosso.Run argument list per stdin line
+ * (tab-separated, same order as Run expects) and executes it in the already
+ * warm JVM. Drivers that issue many runs against the same jar pay startup,
+ * class loading and JIT warmup once instead of per run.
+ *
+ * Prints "READY" once at startup and "DONE ok"/"DONE error" after each job so
+ * a driver can frame the combined output stream. An empty line or EOF shuts
+ * the worker down.
+ */
+public class Server {
+
+    public static void main(String[] args) throws IOException {
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+        System.out.println("READY");
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.isEmpty()) break;
+            try {
+                Run.main(line.split("\t"));
+                System.out.println("DONE ok");
+            } catch (Exception e) {
+                e.printStackTrace();
+                System.out.println("DONE error");
+            }
+        }
+    }
+}
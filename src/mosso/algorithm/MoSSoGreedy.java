@@ -341,7 +341,7 @@ public class MoSSoGreedy extends SupernodeHelper {
             // since node dst is an isolated node
             deactivateNode(dst);
         }
-        if (iteration % interval == 0) {
+        if (interval > 0 && iteration % interval == 0) {
             System.out.print(iteration);
             System.out.print(" : Elapsed time : " + (System.currentTimeMillis() - start) / 1000.);
             System.out.println(" : ratio : " + (costCounter / ((double)ecnt)));
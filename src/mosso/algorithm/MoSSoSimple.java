@@ -356,7 +356,7 @@ public class MoSSoSimple extends SupernodeHelper {
             deactivateNode(dst);
         }
 
-        if (iteration % interval == 0) {
+        if (interval > 0 && iteration % interval == 0) {
             System.out.print(iteration);
             System.out.print(" : Elapsed time : " + (System.currentTimeMillis() - start) / 1000.);
             System.out.println(" : ratio : " + (costCounter / ((double)ecnt)));